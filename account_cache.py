@@ -0,0 +1,67 @@
+# account_cache.py
+import sys
+from collections import OrderedDict
+
+
+def approx_size(obj, _seen=None):
+    """Rough deep size in bytes of plain containers, strings and numbers."""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(approx_size(k, _seen) + approx_size(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(approx_size(item, _seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += approx_size(vars(obj), _seen)
+    return size
+
+
+class AccountStateCache:
+    """
+    In-memory state for accounts that were recently signed in on this device
+    (schedule, event pins, last forum, map settings), so switching back to one
+    restores it without any MongoDB round trips. Least recently used accounts
+    are evicted once there are more than `max_accounts` or their estimated
+    size passes `max_bytes`.
+    """
+
+    def __init__(self, max_accounts=5, max_bytes=16 * 1024 * 1024):
+        self.max_accounts = max_accounts
+        self.max_bytes = max_bytes
+        self._states = OrderedDict()  # username -> (state dict, approx bytes)
+        self.total_bytes = 0
+
+    def __len__(self):
+        return len(self._states)
+
+    def __contains__(self, username):
+        return username in self._states
+
+    def get(self, username):
+        """Saved state for an account, or None. Marks it most recently used."""
+        entry = self._states.get(username)
+        if entry is None:
+            return None
+        self._states.move_to_end(username)
+        return entry[0]
+
+    def put(self, username, state):
+        self.pop(username)
+        size = approx_size(state)
+        self._states[username] = (state, size)
+        self.total_bytes += size
+        # Always keep the newest entry, even if it alone is over the byte cap
+        while len(self._states) > 1 and (len(self._states) > self.max_accounts or self.total_bytes > self.max_bytes):
+            self.pop(next(iter(self._states)))
+
+    def pop(self, username):
+        """Remove and return an account's state, or None."""
+        entry = self._states.pop(username, None)
+        if entry is None:
+            return None
+        self.total_bytes -= entry[1]
+        return entry[0]
@@ -0,0 +1,63 @@
+"""
+Offscreen render times (QT_QPA_PLATFORM=offscreen) for the schedule grid,
+the events page and the forum, each timed through a full grab() so layout
+and painting are included. Runs main.py against the in-memory storage.
+
+    python benchmarks/bench_render.py
+"""
+import json
+
+from harness import load_app, make_classes, make_posts, measure
+
+SCHEDULE_SIZES = (10, 100)
+FORUM_POSTS = 1000
+
+
+def run(quick=False):
+    repeat = 3 if quick else 7
+    main, app = load_app()
+    results = {}
+
+    for n in SCHEDULE_SIZES:
+        user = f"render{n}"
+        main.current_user = user
+        main.save_classes(make_classes(n), user)
+        page = main.ScheduleInputPage()
+        page.resize(850, 900)
+        page.schedule_data = main.get_cached_classes(user)
+
+        def render_schedule():
+            page.display_schedule()
+            page.grab()
+        # Start each sample from an empty grid: the grid diffs, so a re-render would be a no-op
+        results[f"display_schedule classes={n}"] = measure(
+            render_schedule, repeat, setup=lambda: page.schedule_grid.set_classes([], set())
+        )
+    main.current_user = None
+
+    events_page = main.UCSCEventsPage()  # scrapes the saved calendar fixtures
+    events_page.resize(850, 900)
+
+    def render_events():
+        events_page.show_events()
+        events_page.grab()
+    results["events page show_events"] = measure(render_events, repeat)
+
+    for post in make_posts(FORUM_POSTS, forum_name="Bench Forum"):
+        main.storage.add_forum_post(post)
+    forum_page = main.ForumPage()
+    forum_page.resize(850, 900)
+    forum_page.current_forum_name = "Bench Forum"
+
+    def render_forum():
+        forum_page.load_forum_posts()
+        forum_page.grab()
+    results[f"forum load_forum_posts posts={FORUM_POSTS}"] = measure(render_forum, max(3, repeat // 2))
+    forum_page.timer.stop()
+
+    app.processEvents()
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,105 @@
+"""
+Schedule write benchmark: old find_one + insert_one vs. the single upsert path.
+
+Runs against a scratch collection on any MongoDB server (defaults to a local one)
+and reports per-write latency and server round trips for each strategy.
+
+    python benchmarks/bench_schedule_writes.py --uri mongodb://localhost:27017 -n 500
+"""
+import argparse
+import statistics
+import time
+import uuid
+
+from pymongo import ASCENDING, MongoClient, UpdateOne
+from pymongo import monitoring
+
+
+class RoundTripCounter(monitoring.CommandListener):
+    """Counts commands sent to the server, i.e. network round trips."""
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+def make_class(i):
+    return {
+        "id": str(uuid.uuid4()),
+        "name": f"CSE {100 + i}",
+        "location": "Baskin Engineering 152",
+        "start_time": "9:20 AM",
+        "days": ["M", "W", "F"],
+    }
+
+
+def two_round_trips(coll, user, data):
+    data["user"] = user
+    if not coll.find_one({"user": user, "id": data["id"]}):
+        coll.insert_one(data)
+
+
+def one_round_trip(coll, user, data):
+    fields = {k: v for k, v in data.items() if k not in ("user", "id")}
+    coll.update_one({"user": user, "id": data["id"]}, {"$setOnInsert": fields}, upsert=True)
+
+
+def run(label, fn, coll, counter, n):
+    user = f"bench-{uuid.uuid4()}"
+    timings = []
+    counter.count = 0
+    for i in range(n):
+        data = make_class(i)
+        start = time.perf_counter()
+        fn(coll, user, data)
+        timings.append((time.perf_counter() - start) * 1000)
+    trips = counter.count / n
+    print(f"{label:<22} median {statistics.median(timings):7.2f} ms   "
+          f"p95 {sorted(timings)[int(n * 0.95) - 1]:7.2f} ms   {trips:.1f} round trips/write")
+
+
+def run_bulk(coll, counter, n):
+    user = f"bench-{uuid.uuid4()}"
+    classes = [make_class(i) for i in range(n)]
+    counter.count = 0
+    start = time.perf_counter()
+    coll.bulk_write([
+        UpdateOne({"user": user, "id": c["id"]},
+                  {"$setOnInsert": {k: v for k, v in c.items() if k != "id"}},
+                  upsert=True)
+        for c in classes
+    ], ordered=False)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{'bulk_write (' + str(n) + ')':<22} total  {elapsed:7.2f} ms   {counter.count} round trips")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--uri", default="mongodb://localhost:27017")
+    parser.add_argument("-n", type=int, default=200, help="writes per strategy")
+    args = parser.parse_args()
+
+    counter = RoundTripCounter()
+    client = MongoClient(args.uri, event_listeners=[counter])
+    coll = client["slughub_bench"]["class_schedule"]
+    coll.drop()
+    coll.create_index([("user", ASCENDING), ("id", ASCENDING)], unique=True)
+
+    try:
+        run("find_one + insert_one", two_round_trips, coll, counter, args.n)
+        run("upsert $setOnInsert", one_round_trip, coll, counter, args.n)
+        run_bulk(coll, counter, args.n)
+    finally:
+        client.drop_database("slughub_bench")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Parse throughput of both scrapers over the saved calendar and catalog pages
+in fixtures/, replayed through http_transport so only BeautifulSoup parsing
+and extraction are timed. --latency-ms/--bandwidth-kbps add a simulated link.
+
+    python benchmarks/bench_scrapers.py
+"""
+import argparse
+import json
+
+from harness import measure, use_fixture_http
+
+CALENDAR_PAGES = 5
+
+
+def run(quick=False, latency_ms=0.0, bandwidth_kbps=None):
+    repeat = 3 if quick else 7
+    http = use_fixture_http(CALENDAR_PAGES, latency_ms, bandwidth_kbps)
+    from class_forum_scraper import fetch_all_ucsc_classes
+    from eventscraper import scrape_ucsc_events
+
+    results = {}
+    for name, fn in ((f"scrape_ucsc_events pages={CALENDAR_PAGES}", scrape_ucsc_events),
+                     ("fetch_all_ucsc_classes", fetch_all_ucsc_classes)):
+        http.requests = 0
+        items = len(fn(transport=http))
+        pages = http.requests
+        stats = measure(lambda: fn(transport=http), repeat)
+        stats["items"] = items
+        stats["pages"] = pages
+        stats["pages_per_s"] = round(pages / (stats["median_ms"] / 1000), 1)
+        results[name] = stats
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--bandwidth-kbps", type=float)
+    args = parser.parse_args()
+    print(json.dumps(run(latency_ms=args.latency_ms, bandwidth_kbps=args.bandwidth_kbps), indent=2))
@@ -0,0 +1,48 @@
+"""
+Schedule and forum data paths on the embedded storage backend: the storage
+calls behind get_all_classes/save_class at 10/100/1000 saved classes, and
+loading or polling a forum with 1k/10k posts.
+
+    python benchmarks/bench_storage.py
+"""
+import json
+
+from harness import make_classes, make_posts, make_storage, measure
+
+SCHEDULE_SIZES = (10, 100, 1000)
+FORUM_SIZES = (1000, 10000)
+
+
+def run(quick=False):
+    repeat = 3 if quick else 9
+    results = {}
+
+    for n in SCHEDULE_SIZES:
+        storage = make_storage()
+        user = f"bench{n}"
+        storage.create_user({"username": user, "email": f"{user}@ucsc.edu", "password": "x"})
+        storage.insert_classes(user, make_classes(n))
+        results[f"get_all_classes n={n}"] = measure(lambda: storage.get_classes(user), repeat)
+
+        new_classes = iter(make_classes(repeat * 100, seed=n))
+
+        def save_one():
+            # What save_class does on a miss: one insert plus the version bump
+            if storage.insert_class(user, next(new_classes)):
+                storage.bump_schedule_version(user)
+        results[f"save_class n={n}"] = measure(save_one, repeat, number=100)
+
+    for n in FORUM_SIZES:
+        storage = make_storage()
+        posts = make_posts(n)
+        for post in posts:
+            storage.add_forum_post(post)
+        results[f"forum load posts={n}"] = measure(lambda: storage.forum_posts("CSE 101"), repeat)
+        latest = posts[-2]["timestamp"]
+        results[f"forum poll posts={n}"] = measure(lambda: storage.forum_posts("CSE 101", after=latest), repeat)
+
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
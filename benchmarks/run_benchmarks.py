@@ -0,0 +1,138 @@
+"""
+Run the benchmark suites and compare their medians against baseline.json.
+
+    python benchmarks/run_benchmarks.py                    # compare; exits 1 on a regression
+    python benchmarks/run_benchmarks.py --quick --only storage
+    python benchmarks/run_benchmarks.py --update-baseline  # record this machine's numbers
+    python benchmarks/run_benchmarks.py --skip render      # knowingly leave a suite out
+
+Every suite is required: one that can't run here (render needs PyQt6 with
+Qt WebEngine's system libraries, the scrapers need bs4) fails the run
+unless it is named with --skip. Benchmarks with no baseline entry can't be
+checked either, so they fail the run unless --allow-missing-baseline is
+given. The render suite has no baseline yet: record it on a machine where
+WebEngine loads with --only render --update-baseline. bench_schedule_writes.py needs a live
+MongoDB server and is run on its own. Baselines only mean something on the
+machine that recorded them; re-record after changing hardware.
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import sys
+from datetime import datetime
+
+from harness import BENCH_DIR
+
+SUITES = {
+    "storage": "bench_storage",
+    "scrapers": "bench_scrapers",
+    "render": "bench_render",
+}
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return {"results": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(results, baseline, tolerance):
+    """
+    Print one line per benchmark. Returns (names slower than the tolerance
+    allows, names with no baseline to compare against).
+    """
+    regressions, unchecked = [], []
+    for name, stats in results.items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"  {stats['median_ms']:>10.3f} ms  {'NO BASELINE':>11}  {name}")
+            unchecked.append(name)
+            continue
+        ratio = stats["median_ms"] / base["median_ms"] if base["median_ms"] else 1.0
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  << REGRESSION"
+            regressions.append(name)
+        print(f"  {stats['median_ms']:>10.3f} ms  {ratio:>10.2f}x  {name}{flag}")
+    return regressions, unchecked
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--only", action="append", choices=sorted(SUITES), help="run just these suites")
+    parser.add_argument("--skip", action="append", default=[], choices=sorted(SUITES),
+                        help="leave these suites out instead of failing when they can't run")
+    parser.add_argument("--quick", action="store_true", help="fewer repeats, for a smoke run")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown before failing (0.5 = 50%%)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--output", help="also write this run's results to a JSON file")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--allow-missing-baseline", action="store_true",
+                        help="don't fail on benchmarks that have no baseline entry")
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.baseline)
+    results, skipped, regressions, unchecked = {}, {}, [], []
+    for suite in args.only or SUITES:
+        if suite in args.skip:
+            skipped[suite] = "--skip"
+            print(f"[{suite}] skipped by request")
+            continue
+        try:
+            module = importlib.import_module(SUITES[suite])
+            print(f"[{suite}]")
+            suite_results = module.run(quick=args.quick)
+        except ImportError as e:
+            skipped[suite] = str(e)
+            print(f"[{suite}] COULD NOT RUN: {e}")
+            continue
+        suite_regressions, suite_unchecked = compare(suite_results, baseline, args.tolerance)
+        if suite_unchecked and len(suite_unchecked) == len(suite_results):
+            print(f"[{suite}] has no baseline: NOT CHECKED for regressions")
+        regressions += suite_regressions
+        unchecked += suite_unchecked
+        results.update(suite_results)
+
+    run = {
+        "recorded": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+        "skipped": skipped,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(run, f, indent=2)
+
+    if args.update_baseline:
+        # Keep entries for suites that were skipped or not selected this time
+        run["results"] = {**baseline.get("results", {}), **results}
+        run.pop("skipped")
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(run, f, indent=2)
+        print(f"Updated {args.baseline} with {len(results)} results")
+        return 0
+
+    not_run = [suite for suite, reason in skipped.items() if reason != "--skip"]
+    if skipped:
+        print(f"Not checked: {', '.join(skipped)}")
+    if not_run:
+        print(f"{len(not_run)} suite(s) could not run; pass --skip {' --skip '.join(not_run)} to accept that")
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    if not_run:
+        return 1
+    if unchecked:
+        print(f"{len(unchecked)} benchmark(s) have no baseline and were not checked: {', '.join(unchecked)}")
+        return 0 if args.allow_missing_baseline else 1
+    print(f"No regressions over {args.tolerance:.0%} in {len(results)} benchmark(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
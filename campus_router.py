@@ -0,0 +1,186 @@
+# campus_router.py
+import heapq
+import json
+
+from geo import haversine_m
+from geocode_cache import GRAPH_PATH, clean_location, is_placeholder
+
+# Meters per second for each travel mode on each kind of edge. A mode can't use
+# an edge kind it has no speed for. Walking a bike up a footpath counts as walking.
+MODE_SPEEDS = {
+    "WALKING":   {"path": 1.3, "road": 1.3, "bike": 1.3},
+    "BICYCLING": {"path": 1.3, "road": 4.5, "bike": 5.0},
+    "DRIVING":   {"path": 1.3, "road": 9.0},
+    "TRANSIT":   {"path": 1.3, "road": 1.3, "bike": 1.3, "shuttle": 6.0},
+}
+SHUTTLE_DWELL_SECONDS = 45  # per stop-to-stop hop
+MAX_SNAP_METERS = 1500      # farther than this from any node isn't "on campus"
+SHORT_ALIAS_LENGTH = 4      # aliases shorter than this ("be", "cu", "e2") only match as the first word
+
+
+class CampusRouter:
+    """
+    Shortest paths over the bundled UCSC building/path graph with A*.
+    Nodes are buildings, junctions and shuttle stops; edges carry a kind
+    (path, road, bike, shuttle) and a factor over straight-line distance for
+    hills and winding paths. Costs are travel seconds for the chosen mode.
+    """
+
+    def __init__(self, graph_path=GRAPH_PATH):
+        with open(graph_path, "r", encoding="utf-8") as f:
+            graph = json.load(f)
+        self.nodes = graph["nodes"]
+        self._adjacency = {node_id: [] for node_id in self.nodes}
+        for edge in graph["edges"]:
+            a, b, kind = edge[:3]
+            factor = edge[3] if len(edge) > 3 else 1.0
+            meters = haversine_m(self._latlng(a), self._latlng(b)) * factor
+            self._adjacency[a].append((b, kind, meters))
+            self._adjacency[b].append((a, kind, meters))
+
+        # alias -> node id, longest aliases first so "jack baskin auditorium" beats "baskin"
+        aliases = [(alias, node_id) for node_id, node in self.nodes.items() for alias in node.get("aliases", [])]
+        self._aliases = sorted(aliases, key=lambda a: -len(a[0]))
+
+    def _latlng(self, node_id):
+        node = self.nodes[node_id]
+        return node["lat"], node["lng"]
+
+    def resolve(self, location):
+        """
+        Building node id for a free-text class location, or None if it isn't a
+        known building. Aliases match whole words of the location with its
+        room number still on, so "College 9" and "Engineering 2" keep their
+        number; short abbreviations must start it, so "To be announced"
+        isn't Baskin ("be").
+        """
+        if is_placeholder(location):
+            return None
+        key = clean_location(location)
+        padded = f" {key} "
+        for alias, node_id in self._aliases:
+            if len(alias) < SHORT_ALIAS_LENGTH:
+                if padded.startswith(f" {alias} "):
+                    return node_id
+            elif f" {alias} " in padded:
+                return node_id
+        return None
+
+    def nearest(self, latlng):
+        """Closest node to a (lat, lng), or None if it's nowhere near campus."""
+        node_id, dist = min(((n, haversine_m(latlng, self._latlng(n))) for n in self.nodes), key=lambda x: x[1])
+        return node_id if dist <= MAX_SNAP_METERS else None
+
+    def _edge_seconds(self, kind, meters, mode):
+        speed = MODE_SPEEDS[mode].get(kind)
+        if speed is None:
+            return None
+        seconds = meters / speed
+        if kind == "shuttle":
+            seconds += SHUTTLE_DWELL_SECONDS
+        return seconds
+
+    def shortest_path(self, start, goal, mode="WALKING"):
+        """A* from node to node; returns (node ids, seconds, meters) or None if unreachable."""
+        if mode not in MODE_SPEEDS:
+            raise ValueError(f"Unknown travel mode: {mode}")
+        top_speed = max(MODE_SPEEDS[mode].values())
+        goal_latlng = self._latlng(goal)
+
+        def heuristic(node_id):
+            # Straight line at the mode's best speed never overestimates
+            return haversine_m(self._latlng(node_id), goal_latlng) / top_speed
+
+        open_heap = [(heuristic(start), 0.0, start)]
+        best = {start: 0.0}
+        came_from = {}
+        while open_heap:
+            _, seconds, node_id = heapq.heappop(open_heap)
+            if node_id == goal:
+                path = [goal]
+                meters = 0.0
+                while path[-1] in came_from:
+                    prev, edge_meters = came_from[path[-1]]
+                    path.append(prev)
+                    meters += edge_meters
+                return path[::-1], seconds, meters
+            if seconds > best.get(node_id, float("inf")):
+                continue
+            for neighbor, kind, edge_meters in self._adjacency[node_id]:
+                cost = self._edge_seconds(kind, edge_meters, mode)
+                if cost is None:
+                    continue
+                total = seconds + cost
+                if total < best.get(neighbor, float("inf")):
+                    best[neighbor] = total
+                    came_from[neighbor] = (node_id, edge_meters)
+                    heapq.heappush(open_heap, (total + heuristic(neighbor), total, neighbor))
+        return None
+
+    def route(self, origin, destination, mode="WALKING"):
+        """
+        Route from an origin (lat, lng) or location string to a destination
+        location string or (lat, lng). Returns a dict ready to hand to map.html:
+        {"path": [[lat, lng], ...], "steps": [...], "duration_s", "distance_m", "mode"},
+        or None if either end isn't on the campus graph.
+        """
+        start = self.nearest(origin) if isinstance(origin, (tuple, list)) else self.resolve(origin)
+        goal = self.nearest(destination) if isinstance(destination, (tuple, list)) else self.resolve(destination)
+        if start is None or goal is None:
+            return None
+        found = self.shortest_path(start, goal, mode)
+        if found is None:
+            return None
+        path, seconds, meters = found
+        points = [list(self._latlng(n)) for n in path]
+        if isinstance(origin, (tuple, list)):
+            points.insert(0, list(origin))
+        return {
+            "path": points,
+            "steps": [self.nodes[n]["name"] for n in path],
+            "duration_s": round(seconds),
+            "distance_m": round(meters),
+            "mode": mode,
+            "destination": self.nodes[goal]["name"],
+        }
+
+
+_default_router = None
+
+
+def get_router():
+    """Shared router over the bundled graph, loaded on first use."""
+    global _default_router
+    if _default_router is None:
+        _default_router = CampusRouter()
+    return _default_router
+
+
+if __name__ == "__main__":
+    # python campus_router.py: sanity-check alias resolution against the bundled graph
+    router = CampusRouter()
+    expected = {
+        "Engineering 2 192": "engineering_2",
+        "Engineering 2": "engineering_2",
+        "College 9": "college_nine",
+        "College 10": "college_ten",
+        "College Nine Lecture Hall": "college_nine",
+        "Social Sciences 2 075": "social_sciences",
+        "BE 152": "baskin",
+        "Baskin Engineering 152": "baskin",
+        "Jack Baskin Auditorium 101": "jack_baskin_aud",
+        "CU 2": "classroom_unit",
+        "Classroom Unit 2": "classroom_unit",
+        "Kerr Hall Room 212": "kerr_hall",
+        "To be announced": None,
+        "Office hours in CU or online": None,
+        "Meet at the be careful sign": None,
+        "TBD": None,
+        "Online": None,
+    }
+    failures = [(text, router.resolve(text), node_id) for text, node_id in expected.items()
+                if router.resolve(text) != node_id]
+    for text, got, want in failures:
+        print(f"resolve({text!r}) = {got!r}, expected {want!r}")
+    print(f"{len(expected) - len(failures)}/{len(expected)} resolve checks passed")
+    raise SystemExit(1 if failures else 0)
@@ -1,18 +1,24 @@
-import requests
 from bs4 import BeautifulSoup
+from http_transport import get_transport
+from tracing import span, traced
 
 BASE_URL = "https://catalog.ucsc.edu"
 COURSES_URL = BASE_URL + "/en/Current/General-Catalog/Courses"
 
-def fetch_all_ucsc_classes():
+@traced(cat="http")
+def fetch_all_ucsc_classes(transport=None):
     """
     Returns a sorted list of all course codes found on the UCSC Catalog site.
     Example format: ["CSE 12", "CSE 107", "MATH 19A", "MATH 19B", ...]
+    Pages are fetched through `transport` (see http_transport.py), defaulting
+    to the one selected by SLUGHUB_HTTP_MODE.
     """
+    transport = transport or get_transport()
     all_classes = set()  # use a set to avoid duplicates
 
     # 1) Fetch the main "Courses" page
-    resp = requests.get(COURSES_URL)
+    with span("GET", "http", url=COURSES_URL):
+        resp = transport.get(COURSES_URL)
     if not resp.ok:
         print("Failed to fetch main courses page.")
         return []
@@ -30,7 +36,8 @@ def fetch_all_ucsc_classes():
 
     # 3) For each department link, open and parse course codes
     for dlink in department_links:
-        d_resp = requests.get(dlink)
+        with span("GET", "http", url=dlink):
+            d_resp = transport.get(dlink)
         if not d_resp.ok:
             continue
 
@@ -0,0 +1,115 @@
+# db_client.py
+import importlib.util
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+from pymongo import MongoClient, monitoring
+from pymongo.server_api import ServerApi
+
+import tracing
+
+# Wire compressor -> the module pymongo needs for it
+COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
+
+def available_compressors(names):
+    """The requested compressors whose Python package is installed, in order of preference."""
+    names = [n.strip() for n in names if n.strip()]
+    return [n for n in names if n in COMPRESSOR_MODULES and importlib.util.find_spec(COMPRESSOR_MODULES[n])]
+
+
+def _flag(value):
+    return value.strip().lower() not in ("0", "false", "no", "off")
+
+
+def mongo_client_options(env=os.environ):
+    """
+    MongoClient keyword arguments from SLUGHUB_MONGO_* variables. Timeouts are
+    bounded by default so a network blip fails a call in seconds instead of
+    hanging whatever is waiting on it.
+    """
+    options = {
+        "maxPoolSize": int(env.get("SLUGHUB_MONGO_MAX_POOL", "20")),
+        "minPoolSize": int(env.get("SLUGHUB_MONGO_MIN_POOL", "0")),
+        "serverSelectionTimeoutMS": int(env.get("SLUGHUB_MONGO_SERVER_SELECTION_MS", "5000")),
+        "connectTimeoutMS": int(env.get("SLUGHUB_MONGO_CONNECT_MS", "5000")),
+        "socketTimeoutMS": int(env.get("SLUGHUB_MONGO_SOCKET_MS", "20000")),
+        "retryWrites": _flag(env.get("SLUGHUB_MONGO_RETRY_WRITES", "1")),
+        "retryReads": _flag(env.get("SLUGHUB_MONGO_RETRY_READS", "1")),
+        "readPreference": env.get("SLUGHUB_MONGO_READ_PREFERENCE", "primary"),
+    }
+    compressors = available_compressors(env.get("SLUGHUB_MONGO_COMPRESSORS", "zstd,snappy,zlib").split(","))
+    if compressors:
+        options["compressors"] = compressors
+    return options
+
+
+class CommandLatencyRecorder(monitoring.CommandListener):
+    """
+    Per-command latency from pymongo's command monitoring events: counts,
+    failures, total time and a window of recent samples for percentiles.
+    Events arrive on whichever thread ran the command, hence the lock.
+    """
+
+    def __init__(self, window=500):
+        self._lock = threading.Lock()
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+        self._counts = defaultdict(int)
+        self._failures = defaultdict(int)
+        self._total_ms = defaultdict(float)
+
+    def _record(self, event, failed):
+        ms = event.duration_micros / 1000
+        if tracing.ENABLED:
+            end = time.perf_counter()
+            tracing.record(f"mongo {event.command_name}", "mongo", end - ms / 1000, end, {"failed": failed} if failed else None)
+        with self._lock:
+            self._samples[event.command_name].append(ms)
+            self._counts[event.command_name] += 1
+            self._total_ms[event.command_name] += ms
+            if failed:
+                self._failures[event.command_name] += 1
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record(event, failed=False)
+
+    def failed(self, event):
+        self._record(event, failed=True)
+
+    def stats(self):
+        """{command name: {"count", "failures", "total_ms", "p50_ms", "p95_ms", "max_ms"}}"""
+        result = {}
+        with self._lock:
+            for name, samples in self._samples.items():
+                ordered = sorted(samples)
+                result[name] = {
+                    "count": self._counts[name],
+                    "failures": self._failures[name],
+                    "total_ms": round(self._total_ms[name], 2),
+                    "p50_ms": round(ordered[len(ordered) // 2], 2),
+                    "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+                    "max_ms": round(ordered[-1], 2),
+                }
+        return result
+
+    def report(self):
+        """Plain-text table, most total time first."""
+        stats = sorted(self.stats().items(), key=lambda item: -item[1]["total_ms"])
+        lines = [f"{'command':<16}{'count':>7}{'fail':>6}{'total ms':>11}{'p50':>9}{'p95':>9}{'max':>9}"]
+        for name, s in stats:
+            lines.append(f"{name:<16}{s['count']:>7}{s['failures']:>6}{s['total_ms']:>11.1f}"
+                         f"{s['p50_ms']:>9.1f}{s['p95_ms']:>9.1f}{s['max_ms']:>9.1f}")
+        return "\n".join(lines)
+
+
+def build_mongo_client(uri, listener=None, **overrides):
+    """MongoClient with the Stable API, env-driven pooling/compression/timeouts, and an optional listener."""
+    options = mongo_client_options()
+    options.update(overrides)
+    listeners = [listener] if listener is not None else []
+    return MongoClient(uri, server_api=ServerApi('1'), event_listeners=listeners, **options)
@@ -1,15 +1,20 @@
 # event_scraper.py
-import requests
 from bs4 import BeautifulSoup
+from http_transport import get_transport
+from tracing import span, traced
 
 BASE_URL = "https://calendar.ucsc.edu/calendar/"
 
-def scrape_ucsc_events(start_page=1, max_pages=5):
+@traced(cat="http")
+def scrape_ucsc_events(start_page=1, max_pages=5, transport=None):
+    # transport: anything with get(url), e.g. a ReplayTransport; defaults to SLUGHUB_HTTP_MODE's
+    transport = transport or get_transport()
     events = []
 
     for page_num in range(start_page, start_page + max_pages):
         url = f"{BASE_URL}{page_num}"
-        response = requests.get(url)
+        with span("GET", "http", url=url):
+            response = transport.get(url)
         if response.status_code != 200:
             break
 
@@ -0,0 +1,14 @@
+# geo.py
+import math
+
+UCSC_LATLNG = (36.9914, -122.0609)
+EARTH_RADIUS_M = 6371000
+
+
+def haversine_m(a, b):
+    """Great-circle distance in meters between two (lat, lng) pairs."""
+    lat1, lng1 = map(math.radians, a)
+    lat2, lng2 = map(math.radians, b)
+    h = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(h))
@@ -0,0 +1,149 @@
+# geocode_cache.py
+import json
+import os
+import re
+from functools import lru_cache
+
+from geo import UCSC_LATLNG, haversine_m
+
+GRAPH_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "campus_graph.json")
+ROOM_PREFIX_RE = re.compile(r"\s+(?:room|rm)\s*[a-z]?\d+[a-z]?$")
+ROOM_NUMBER_RE = re.compile(r"\s+[a-z]?\d+[a-z]?$")
+# Locations that name no place; geocoding them returns somewhere arbitrary
+PLACEHOLDER_LOCATIONS = {"", "tbd", "tba", "to be announced", "to be determined", "online",
+                         "remote", "zoom", "virtual", "none", "n a", "arranged"}
+MAX_CAMPUS_DISTANCE_M = 5000  # geocodes farther than this from UCSC are wrong, not a building
+
+
+@lru_cache(maxsize=1)
+def building_names():
+    """Building names and aliases from the bundled campus graph."""
+    try:
+        with open(GRAPH_PATH, "r", encoding="utf-8") as f:
+            nodes = json.load(f)["nodes"]
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠️ Could not read building names from {GRAPH_PATH}: {e}")
+        return frozenset()
+    return frozenset(alias for node in nodes.values() for alias in node.get("aliases", []))
+
+
+def clean_location(text):
+    """Lowercase, punctuation to spaces, single spaces."""
+    key = re.sub(r"[^\w\s]", " ", (text or "").lower())
+    return re.sub(r"\s+", " ", key).strip()
+
+
+def normalize_location(text):
+    """
+    Key for a free-text class location: clean_location() without the room
+    number, so "Baskin Engineering 152" and "baskin engineering, 165" share
+    one building entry. Only explicit room tokens go: a "Room"/"Rm" number,
+    or a number after a known building name. Numbered buildings such as
+    "College 9" and "Social Sciences 2" keep their number.
+    """
+    key = clean_location(text)
+    stripped = ROOM_PREFIX_RE.sub("", key)
+    if stripped == key and key not in building_names():
+        match = ROOM_NUMBER_RE.search(key)
+        if match and key[:match.start()] in building_names():
+            stripped = key[:match.start()]
+    return stripped or key
+
+
+def is_placeholder(location):
+    """True for "TBD", "Online" and the like, which aren't places to geocode."""
+    return clean_location(location) in PLACEHOLDER_LOCATIONS
+
+
+def plausible_geocode(lat, lng):
+    """True if (lat, lng) is close enough to campus to be a UCSC building."""
+    return haversine_m((lat, lng), UCSC_LATLNG) <= MAX_CAMPUS_DISTANCE_M
+
+
+class GeocodeCache:
+    """
+    Location string -> (lat, lng). Backed by a local JSON file and, when a
+    storage backend is given, its shared geocodes so each building is
+    geocoded once for every user rather than once per route request.
+    """
+
+    def __init__(self, path=None, storage=None):
+        self.path = path
+        self.storage = storage
+        self._coords = {}
+        self._asked = set()  # keys already looked up in the shared collection
+        self._load()
+
+    def __len__(self):
+        return len(self._coords)
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._coords = {k: tuple(v) for k, v in json.load(f).items()}
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable geocode cache {self.path}: {e}")
+
+    def _save(self):
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self._coords, f)
+        except OSError as e:
+            print(f"⚠️ Could not save geocode cache: {e}")
+
+    def lookup(self, location):
+        """Cached (lat, lng) for a location string, or None. Never touches the network."""
+        return self._coords.get(normalize_location(location))
+
+    def missing(self, locations):
+        """Normalized keys for locations we have no coordinates for and haven't asked about."""
+        keys = {normalize_location(loc) for loc in locations if loc and not is_placeholder(loc)}
+        return sorted(k for k in keys if k and k not in self._coords and k not in self._asked)
+
+    def fetch_shared(self, keys):
+        """Blocking: one query against the shared geocodes. Safe to call off the GUI thread."""
+        if self.storage is None or not keys:
+            return {}
+        try:
+            return self.storage.find_geocodes(keys)
+        except Exception as e:
+            print(f"[Storage] Error loading geocodes: {e}")
+            return {}
+
+    def merge(self, keys, found):
+        """Record the result of fetch_shared(keys) locally, skipping entries that are off campus."""
+        self._asked.update(keys)
+        found = {key: latlng for key, latlng in (found or {}).items() if plausible_geocode(*latlng)}
+        if found:
+            self._coords.update(found)
+            self._save()
+
+    def store(self, location, lat, lng):
+        """
+        Remember a resolved location locally; returns True if it was new.
+        Placeholders and results off campus are refused, so a bad
+        free-text geocode is never kept or shared.
+        """
+        key = normalize_location(location)
+        if not key or key in self._coords:
+            return False
+        if is_placeholder(location) or not plausible_geocode(lat, lng):
+            print(f"⚠️ Not caching geocode for {location!r}: ({lat:.4f}, {lng:.4f})")
+            return False
+        self._coords[key] = (lat, lng)
+        self._save()
+        return True
+
+    def share(self, location, lat, lng):
+        """Blocking: publish a resolved location to the shared geocodes."""
+        if self.storage is None or is_placeholder(location) or not plausible_geocode(lat, lng):
+            return
+        try:
+            self.storage.save_geocode(normalize_location(location), lat, lng, location)
+        except Exception as e:
+            print(f"[Storage] Error saving geocode: {e}")
@@ -0,0 +1,139 @@
+# http_transport.py
+import atexit
+import json
+import os
+import threading
+import time
+
+try:
+    import requests
+except ImportError:  # replay mode works without it
+    requests = None
+
+# SLUGHUB_HTTP_MODE: "live" (default), "record" (live, and save every response to
+# the cassette) or "replay" (serve responses from the cassette, no network).
+HTTP_MODE = os.getenv("SLUGHUB_HTTP_MODE", "live").lower()
+HTTP_CASSETTE = os.getenv("SLUGHUB_HTTP_CASSETTE", "http_cassette.json")
+HTTP_TIMEOUT = float(os.getenv("SLUGHUB_HTTP_TIMEOUT", "15"))
+
+
+class CassetteResponse:
+    """The parts of requests.Response the scrapers use."""
+
+    def __init__(self, url, status_code, text, headers=None):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+
+class LiveTransport:
+    """Real HTTP through one requests.Session, so repeat hosts reuse connections."""
+
+    def __init__(self, timeout=HTTP_TIMEOUT):
+        if requests is None:
+            raise RuntimeError("the requests package is needed for live HTTP")
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def get(self, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.get(url, **kwargs)
+
+
+class RecordingTransport:
+    """Fetches live and keeps every response for the cassette, written at exit or by save()."""
+
+    def __init__(self, path, inner=None):
+        self.path = path
+        self.inner = inner or LiveTransport()
+        self._responses = _load_cassette(path) if os.path.exists(path) else {}
+        self._lock = threading.Lock()
+        atexit.register(self.save)
+
+    def get(self, url, **kwargs):
+        response = self.inner.get(url, **kwargs)
+        with self._lock:
+            self._responses[url] = {
+                "status_code": response.status_code,
+                "text": response.text,
+                "headers": {"Content-Type": response.headers.get("Content-Type", "")},
+            }
+        return response
+
+    def save(self):
+        with self._lock:
+            responses = dict(self._responses)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "responses": responses}, f)
+        os.replace(tmp_path, self.path)
+
+
+class ReplayTransport:
+    """
+    Serves recorded responses without touching the network. URLs that weren't
+    recorded get a 404, which the scrapers already treat as "no more pages".
+    latency_ms and bandwidth_kbps simulate a slower link per request.
+    """
+
+    def __init__(self, path=None, responses=None, latency_ms=0.0, bandwidth_kbps=None):
+        self.responses = responses if responses is not None else _load_cassette(path)
+        self.latency_ms = latency_ms
+        self.bandwidth_kbps = bandwidth_kbps
+        self.misses = []
+
+    def get(self, url, **kwargs):
+        recorded = self.responses.get(url)
+        if recorded is None:
+            self.misses.append(url)
+            print(f"⚠️ No recorded response for {url}")
+            return CassetteResponse(url, 404, "")
+        delay = self.latency_ms / 1000
+        if self.bandwidth_kbps:
+            delay += len(recorded["text"].encode("utf-8")) * 8 / (self.bandwidth_kbps * 1000)
+        if delay:
+            time.sleep(delay)
+        return CassetteResponse(url, recorded["status_code"], recorded["text"], recorded.get("headers"))
+
+
+def _load_cassette(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["responses"]
+
+
+def transport_from_env():
+    """Build the transport selected by SLUGHUB_HTTP_MODE / SLUGHUB_HTTP_CASSETTE."""
+    if HTTP_MODE == "replay":
+        bandwidth = os.getenv("SLUGHUB_HTTP_BANDWIDTH_KBPS")
+        return ReplayTransport(
+            HTTP_CASSETTE,
+            latency_ms=float(os.getenv("SLUGHUB_HTTP_LATENCY_MS", "0")),
+            bandwidth_kbps=float(bandwidth) if bandwidth else None
+        )
+    if HTTP_MODE == "record":
+        return RecordingTransport(HTTP_CASSETTE)
+    if HTTP_MODE != "live":
+        raise ValueError(f"Unknown SLUGHUB_HTTP_MODE: {HTTP_MODE}")
+    return LiveTransport()
+
+
+_default_transport = None
+
+
+def get_transport():
+    """Shared transport for callers that weren't given one, created on first use."""
+    global _default_transport
+    if _default_transport is None:
+        _default_transport = transport_from_env()
+    return _default_transport
+
+
+def set_default_transport(transport):
+    """Replace the shared transport, e.g. with a ReplayTransport in benchmarks."""
+    global _default_transport
+    _default_transport = transport
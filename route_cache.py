@@ -0,0 +1,77 @@
+# route_cache.py
+import json
+import os
+import time
+from collections import OrderedDict
+
+
+class RouteCache:
+    """
+    LRU + TTL store for serialized DirectionsResults, keyed by
+    "<origin cell>|<destination>|<travel mode>". map.html keeps its own copy in
+    memory; this side persists them across launches so repeat routes don't
+    cost a DirectionsService request.
+    """
+
+    def __init__(self, path=None, ttl=6 * 3600, max_entries=200):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> {"savedAt": epoch ms, "result": json str}
+        self.dirty = False
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _expired(self, entry, now_ms):
+        return now_ms - entry["savedAt"] > self.ttl * 1000
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self._expired(entry, time.time() * 1000):
+            del self._entries[key]
+            self.dirty = True
+            return None
+        self._entries.move_to_end(key)
+        return entry["result"]
+
+    def put(self, key, result, saved_at=None):
+        self._entries[key] = {"savedAt": saved_at or time.time() * 1000, "result": result}
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self.dirty = True
+
+    def items(self):
+        """Live entries, least recently used first, as {key: {"savedAt", "result"}}."""
+        now_ms = time.time() * 1000
+        for key in [k for k, e in self._entries.items() if self._expired(e, now_ms)]:
+            del self._entries[key]
+            self.dirty = True
+        return dict(self._entries)
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable route cache {self.path}: {e}")
+            return
+        for key, entry in stored.items():
+            self.put(key, entry["result"], entry["savedAt"])
+        self.items()  # drop anything that expired while we were closed
+        self.dirty = False
+
+    def save(self):
+        if not self.path or not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.items(), f)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
@@ -0,0 +1,217 @@
+# schedule_ics.py
+import re
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from schedule_index import DAY_ORDER, meeting_duration, parse_time_range
+
+# RFC 5545 weekday codes <-> the schedule page's day letters
+ICS_DAYS = {"MO": "M", "TU": "T", "WE": "W", "TH": "Th", "FR": "F"}
+DAY_TO_ICS = {v: k for k, v in ICS_DAYS.items()}
+
+PRODID = "-//SlugHub//Class Schedule//EN"
+
+
+def _unfold(lines):
+    """Join RFC 5545 folded lines (continuations start with a space or tab)."""
+    current = None
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def _split_property(line):
+    """'DTSTART;TZID=America/Los_Angeles:20261005T092000' -> ('DTSTART', {'TZID': ...}, '2026...')"""
+    head, _, value = line.partition(":")
+    name, *params = head.split(";")
+    return name.upper(), dict(p.split("=", 1) for p in params if "=" in p), value
+
+
+ESCAPE_RE = re.compile(r"\\(.)")
+UNESCAPED = {"n": "\n", "N": "\n", ",": ",", ";": ";", "\\": "\\"}
+
+
+def _unescape(text):
+    # One pass, so the "n" after an escaped backslash isn't read as a newline
+    return ESCAPE_RE.sub(lambda m: UNESCAPED.get(m.group(1), m.group(0)), text)
+
+
+def _escape(text):
+    return (text.replace("\\", "\\\\").replace(";", "\\;")
+                .replace(",", "\\,").replace("\n", "\\n"))
+
+
+def _parse_datetime(value, params):
+    """Parse a DTSTART/DTEND value into a local wall-clock datetime (None for all-day dates)."""
+    if params.get("VALUE") == "DATE" or "T" not in value:
+        return None
+    if value.endswith("Z"):
+        utc = datetime.strptime(value[:-1], "%Y%m%dT%H%M%S").replace(tzinfo=timezone.utc)
+        return utc.astimezone().replace(tzinfo=None)
+    # Floating or TZID times are treated as campus wall-clock time
+    return datetime.strptime(value[:15], "%Y%m%dT%H%M%S")
+
+
+def _parse_duration(value):
+    """Minimal RFC 5545 DURATION parser, e.g. PT1H5M or P1D."""
+    days = hours = minutes = 0
+    number = ""
+    for ch in value.lstrip("+-P"):
+        if ch.isdigit():
+            number += ch
+        elif ch in "DHMW" and number:
+            if ch == "W":
+                days += 7 * int(number)
+            elif ch == "D":
+                days += int(number)
+            elif ch == "H":
+                hours += int(number)
+            else:
+                minutes += int(number)
+            number = ""
+    return timedelta(days=days, hours=hours, minutes=minutes)
+
+
+def format_clock(minutes):
+    """Minutes after midnight -> '9:20 AM', matching the schedule page's presets."""
+    hour, minute = divmod(minutes, 60)
+    return f"{(hour % 12) or 12}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+
+def iter_vevents(lines):
+    """Stream VEVENT components out of an iterable of ICS lines as {NAME: (params, value)} dicts."""
+    event = None
+    for line in _unfold(lines):
+        name, params, value = _split_property(line)
+        if name == "BEGIN" and value.upper() == "VEVENT":
+            event = {}
+        elif name == "END" and value.upper() == "VEVENT":
+            if event is not None:
+                yield event
+            event = None
+        elif event is not None and name not in event:
+            event[name] = (params, value)
+
+
+def vevent_to_class(event):
+    """
+    Convert one VEVENT into a schedule record, or None if it can't go on the
+    weekday schedule (all-day, weekend-only, or missing a start time).
+    """
+    if "DTSTART" not in event:
+        return None
+    start = _parse_datetime(event["DTSTART"][1], event["DTSTART"][0])
+    if start is None:
+        return None
+
+    end = None
+    if "DTEND" in event:
+        end = _parse_datetime(event["DTEND"][1], event["DTEND"][0])
+    elif "DURATION" in event:
+        end = start + _parse_duration(event["DURATION"][1])
+
+    rrule = {}
+    if "RRULE" in event:
+        rrule = dict(p.split("=", 1) for p in event["RRULE"][1].split(";") if "=" in p)
+
+    if rrule.get("FREQ") == "DAILY" and "BYDAY" not in rrule:
+        days = list(DAY_ORDER)
+    elif "BYDAY" in rrule:
+        # BYDAY entries may carry an ordinal prefix like "1MO"; keep the code
+        codes = [d.strip()[-2:] for d in rrule["BYDAY"].split(",")]
+        days = [ICS_DAYS[c] for c in ICS_DAYS if c in codes]
+    else:
+        days = [DAY_ORDER[start.weekday()]] if start.weekday() < len(DAY_ORDER) else []
+    if not days:
+        return None
+
+    categories = event.get("CATEGORIES", ({}, ""))[1].upper().split(",")
+    uid = event.get("UID", ({}, ""))[1]
+    if uid.endswith("@slughub"):
+        # Our own export: keep the original id so re-imports are no-ops
+        class_id = uid[:-len("@slughub")]
+    elif uid:
+        class_id = str(uuid.uuid5(uuid.NAMESPACE_URL, uid))
+    else:
+        class_id = str(uuid.uuid4())
+    record = {
+        "id": class_id,
+        "name": _unescape(event.get("SUMMARY", ({}, "Untitled"))[1]).strip() or "Untitled",
+        "location": _unescape(event.get("LOCATION", ({}, ""))[1]).strip() or "TBD",
+        "start_time": format_clock(start.hour * 60 + start.minute),
+        "days": days,
+    }
+    if "EVENT" in categories or not rrule:
+        record["is_event"] = True
+
+    # Only spell out the end when it differs from the block length we'd assume
+    if end is not None and end > start:
+        length = int((end - start).total_seconds() // 60)
+        if length != meeting_duration(record):
+            end_minutes = start.hour * 60 + start.minute + length
+            if end_minutes < 24 * 60:
+                record["start_time"] += " - " + format_clock(end_minutes)
+    return record
+
+
+def parse_ics(lines):
+    """Stream schedule records out of an ICS file object or any iterable of lines."""
+    for event in iter_vevents(lines):
+        record = vevent_to_class(event)
+        if record is not None:
+            yield record
+
+
+def _fold(line):
+    """Fold a content line at 75 characters as RFC 5545 asks."""
+    chunks = [line[i:i + 74] for i in range(0, len(line), 74)] or [""]
+    return "\r\n ".join(chunks)
+
+
+def iter_ics(classes, week_of=None):
+    """
+    Yield the lines of a VCALENDAR for the given schedule records. Classes recur
+    weekly on their days starting the week of `week_of` (default: this week);
+    events are written as one-off VEVENTs.
+    """
+    week_of = week_of or datetime.now()
+    monday = (week_of - timedelta(days=week_of.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+    yield "BEGIN:VCALENDAR"
+    yield "VERSION:2.0"
+    yield "PRODID:" + PRODID
+    for cls in classes:
+        start, _ = parse_time_range(cls.get("start_time"))
+        days = [d for d in DAY_ORDER if d in cls.get("days", [])]
+        if start is None or not days:
+            continue
+        first = monday + timedelta(days=DAY_ORDER.index(days[0]), minutes=start)
+        end = first + timedelta(minutes=meeting_duration(cls))
+
+        yield "BEGIN:VEVENT"
+        yield _fold(f"UID:{cls.get('id') or uuid.uuid4()}@slughub")
+        yield "DTSTAMP:" + stamp
+        yield "DTSTART:" + first.strftime("%Y%m%dT%H%M%S")
+        yield "DTEND:" + end.strftime("%Y%m%dT%H%M%S")
+        if cls.get("is_event"):
+            yield "CATEGORIES:EVENT"
+        else:
+            yield "RRULE:FREQ=WEEKLY;BYDAY=" + ",".join(DAY_TO_ICS[d] for d in days)
+        yield _fold("SUMMARY:" + _escape(cls.get("name", "")))
+        yield _fold("LOCATION:" + _escape(cls.get("location", "")))
+        yield "END:VEVENT"
+    yield "END:VCALENDAR"
+
+
+def write_ics(classes, fileobj, week_of=None):
+    """Write schedule records to a file object as an ICS calendar."""
+    for line in iter_ics(classes, week_of):
+        fileobj.write(line + "\r\n")
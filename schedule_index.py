@@ -0,0 +1,172 @@
+# schedule_index.py
+import re
+from bisect import bisect_left, bisect_right
+
+# Same day letters the schedule page uses, indexed by datetime.weekday()
+DAY_ORDER = ["M", "T", "W", "Th", "F"]
+DAY_INDEX = {day: i for i, day in enumerate(DAY_ORDER)}
+
+MINUTES_PER_DAY = 24 * 60
+
+# Default meeting lengths when a start_time has no explicit end:
+# UCSC MWF blocks run 65 minutes, TuTh/MW and evening blocks 95, events an hour.
+MWF_MINUTES = 65
+LONG_BLOCK_MINUTES = 95
+EVENT_MINUTES = 60
+# Meetings longer than this (all-day imported events, say) are kept out of the
+# sweep so they can't widen every overlap query's scan window
+SWEEP_MAX_MINUTES = 4 * 60
+
+TIME_RE = re.compile(r"(\d{1,2})(?::(\d{2}))?\s*([AaPp])?\.?\s*[Mm]?\.?")
+
+
+def parse_clock(text):
+    """
+    Parse a clock time like "9:20 AM", "12:00 PM", "7pm" or "19:30" into
+    minutes after midnight. Returns None if no time can be found.
+    """
+    match = TIME_RE.search(text or "")
+    if not match:
+        return None
+    hour = int(match.group(1))
+    minute = int(match.group(2) or 0)
+    meridiem = (match.group(3) or "").upper()
+    if meridiem == "P" and hour != 12:
+        hour += 12
+    elif meridiem == "A" and hour == 12:
+        hour = 0
+    if hour > 23 or minute > 59:
+        return None
+    return hour * 60 + minute
+
+
+def parse_time_range(start_time):
+    """
+    Split a schedule start_time into (start, end) minutes after midnight.
+    Custom entries look like "6:15 PM - 7:45 PM"; preset ones have no end (None).
+    """
+    parts = re.split(r"\s*[-–]\s*", start_time or "", maxsplit=1)
+    start = parse_clock(parts[0])
+    end = parse_clock(parts[1]) if len(parts) > 1 else None
+    if start is not None and end is not None and end <= start:
+        end = None
+    return start, end
+
+
+def minute_of_week(dt):
+    """Minutes since Monday 00:00 for a datetime."""
+    return dt.weekday() * MINUTES_PER_DAY + dt.hour * 60 + dt.minute
+
+
+def meeting_duration(cls):
+    """Length of one meeting in minutes, from the explicit end or the block defaults."""
+    start, end = parse_time_range(cls.get("start_time"))
+    if start is not None and end is not None:
+        return end - start
+    if cls.get("is_event"):
+        return EVENT_MINUTES
+    if {"M", "W", "F"} <= set(cls.get("days", [])):
+        return MWF_MINUTES
+    return LONG_BLOCK_MINUTES
+
+
+def meeting_starts(cls):
+    """All minute-of-week start offsets for one class record."""
+    start, _ = parse_time_range(cls.get("start_time"))
+    if start is None:
+        return []
+    return sorted(DAY_INDEX[d] * MINUTES_PER_DAY + start for d in cls.get("days", []) if d in DAY_INDEX)
+
+
+class ScheduleIndex:
+    """
+    Every meeting of a user's classes as sorted minute-of-week start offsets.
+    Built once when the schedule is loaded and updated in place on add/remove,
+    so "what's next" lookups are a bisect instead of a rebuild and sort.
+
+    Each meeting also has an end, which makes the index a sorted sweep structure
+    for conflicts: anything overlapping [start, end) must start within
+    max_length minutes before it, so an overlap query is a bisect plus a scan
+    of the meetings starting in [start - max_length, end). That is
+    O(log n + w), where w counts the meetings in that window, not only the
+    overlapping ones. Meetings longer than SWEEP_MAX_MINUTES don't count
+    towards max_length; they are also listed separately and checked on every
+    query, so w stays a few class blocks.
+    """
+
+    def __init__(self, classes=()):
+        self._keys = []     # sorted minute-of-week offsets
+        self._entries = []  # (minute_of_week, class dict), parallel to _keys
+        self._ends = []     # meeting end offsets, parallel to _keys
+        self._max_length = 0  # longest meeting up to SWEEP_MAX_MINUTES
+        self._long = []     # (minute_of_week, end, class dict) for longer meetings, also in _entries
+        for cls in classes:
+            self.add(cls)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def add(self, cls):
+        length = meeting_duration(cls)
+        if length <= SWEEP_MAX_MINUTES:
+            self._max_length = max(self._max_length, length)
+        for start in meeting_starts(cls):
+            if length > SWEEP_MAX_MINUTES:
+                self._long.append((start, start + length, cls))
+            pos = bisect_right(self._keys, start)
+            self._keys.insert(pos, start)
+            self._entries.insert(pos, (start, cls))
+            self._ends.insert(pos, start + length)
+
+    def remove(self, class_id):
+        keep = [i for i, e in enumerate(self._entries) if e[1].get("id") != class_id]
+        self._keys = [self._keys[i] for i in keep]
+        self._entries = [self._entries[i] for i in keep]
+        self._ends = [self._ends[i] for i in keep]
+        self._long = [m for m in self._long if m[2].get("id") != class_id]
+        # Shrink the scan window back if the longest meeting just left
+        lengths = (end - start for start, end in zip(self._keys, self._ends))
+        self._max_length = max((n for n in lengths if n <= SWEEP_MAX_MINUTES), default=0)
+
+    def overlapping(self, start, end):
+        """Meetings (minute_of_week, class dict) that overlap [start, end)."""
+        window_start = start - self._max_length
+        lo = bisect_right(self._keys, window_start)
+        hi = bisect_left(self._keys, end)
+        found = [self._entries[i] for i in range(lo, hi) if self._ends[i] > start]
+        # Long meetings that began before the window can still run into it
+        found += [(m_start, cls) for m_start, m_end, cls in self._long if m_start <= window_start and m_end > start]
+        return found
+
+    def conflicts_for(self, cls):
+        """Other classes in the index that overlap any meeting of cls."""
+        length = meeting_duration(cls)
+        found = {}
+        for start in meeting_starts(cls):
+            for _, other in self.overlapping(start, start + length):
+                if other.get("id") != cls.get("id"):
+                    found[other.get("id")] = other
+        return list(found.values())
+
+    def conflicting_ids(self):
+        """Ids of every class that overlaps at least one other class."""
+        ids = set()
+        for i, (start, cls) in enumerate(self._entries):
+            for _, other in self.overlapping(start, self._ends[i]):
+                if other.get("id") != cls.get("id"):
+                    ids.add(cls.get("id"))
+                    ids.add(other.get("id"))
+        return ids
+
+    def upcoming(self, now_minute):
+        """
+        Meetings over the next week in order: those later today and this week
+        first, then the ones earlier in the week that come round again.
+        Meetings earlier today are skipped, matching the map's old behaviour.
+        """
+        i = bisect_right(self._keys, now_minute)
+        j = bisect_left(self._keys, now_minute - now_minute % MINUTES_PER_DAY)
+        return self._entries[i:] + self._entries[:j]
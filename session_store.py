@@ -0,0 +1,103 @@
+# session_store.py
+import json
+import os
+
+try:
+    import keyring
+except ImportError:  # optional: tokens fall back to the local JSON file
+    keyring = None
+
+KEYRING_SERVICE = "SlugHub"
+
+
+class SessionStore:
+    """
+    Remember-me tokens saved on this device, most recently used account first.
+    The account list lives in a JSON file; the raw tokens go to the OS keyring
+    when the `keyring` package and a backend are available, otherwise into the
+    same file (readable only by the current user).
+    """
+
+    def __init__(self, path, service=KEYRING_SERVICE):
+        self.path = path
+        self.service = service
+        self._accounts = []      # usernames, most recent first
+        self._file_tokens = {}   # username -> token, only when the keyring isn't usable
+        self._load()
+
+    def __len__(self):
+        return len(self._accounts)
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            self._accounts = list(stored.get("accounts", []))
+            self._file_tokens = dict(stored.get("tokens", {}))
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable session store {self.path}: {e}")
+
+    def _save(self):
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"accounts": self._accounts, "tokens": self._file_tokens}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ Could not save session store: {e}")
+
+    def usernames(self):
+        """Accounts with a saved session, most recently used first."""
+        return list(self._accounts)
+
+    def last(self):
+        """The account to resume on startup, or None."""
+        return self._accounts[0] if self._accounts else None
+
+    def get(self, username):
+        if username not in self._accounts:
+            return None
+        if username in self._file_tokens:
+            return self._file_tokens[username]
+        if keyring is not None:
+            try:
+                return keyring.get_password(self.service, username)
+            except Exception as e:
+                print(f"⚠️ Keyring unavailable: {e}")
+        return None
+
+    def put(self, username, token):
+        """Save a token and make this the most recently used account."""
+        self._file_tokens.pop(username, None)
+        stored = False
+        if keyring is not None:
+            try:
+                keyring.set_password(self.service, username, token)
+                stored = True
+            except Exception as e:
+                print(f"⚠️ Keyring unavailable, saving session to {self.path}: {e}")
+        if not stored:
+            self._file_tokens[username] = token
+        self.touch(username)
+
+    def touch(self, username):
+        """Move an account to the front of the list."""
+        self._accounts = [username] + [u for u in self._accounts if u != username]
+        self._save()
+
+    def remove(self, username):
+        if username not in self._accounts:
+            return
+        self._accounts.remove(username)
+        if self._file_tokens.pop(username, None) is None and keyring is not None:
+            try:
+                keyring.delete_password(self.service, username)
+            except Exception:
+                pass  # already gone, or no backend
+        self._save()
@@ -0,0 +1,121 @@
+# stall_watchdog.py
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import defaultdict
+
+from PyQt6.QtCore import QObject, QTimer
+
+import tracing
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+HISTOGRAM_BUCKETS_MS = [100, 250, 500, 1000, 2000, 5000, float("inf")]
+
+
+class StallWatchdog(QObject):
+    """
+    Detects GUI event-loop stalls. A QTimer heartbeat on the GUI thread stamps
+    the time every `interval_ms`; a helper thread watches the stamp and, once
+    the loop has been blocked for `threshold_ms`, grabs the GUI thread's Python
+    stack with sys._current_frames() while it is still stuck. When the loop
+    comes back the stall is logged with its duration, added to a histogram and
+    charged to the app frame it was blocked in.
+    """
+
+    def __init__(self, threshold_ms=250, interval_ms=50, log_path=None, parent=None):
+        super().__init__(parent)
+        self.threshold_ms = threshold_ms
+        self.interval_ms = interval_ms
+        self.log_path = log_path
+        self.histogram = {bucket: 0 for bucket in HISTOGRAM_BUCKETS_MS}
+        self.sources = defaultdict(lambda: [0, 0.0])  # source -> [stalls, total ms]
+
+        self._gui_thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()  # same clock as tracing spans
+        self._pending_stack = None  # set by the helper thread, consumed by the GUI thread
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher = threading.Thread(target=self._watch, name="stall-watchdog", daemon=True)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._beat)
+
+    def start(self):
+        self._last_beat = time.perf_counter()
+        self._timer.start()
+        self._watcher.start()
+
+    def stop(self):
+        self._timer.stop()
+        self._stop.set()
+
+    def _blocked_ms(self, now):
+        return (now - self._last_beat) * 1000 - self.interval_ms
+
+    def _watch(self):
+        while not self._stop.wait(self.interval_ms / 2000):
+            with self._lock:
+                if self._pending_stack is not None or self._blocked_ms(time.perf_counter()) < self.threshold_ms:
+                    continue  # not stalled, or this stall's stack is already captured
+                frame = sys._current_frames().get(self._gui_thread_id)
+                self._pending_stack = traceback.extract_stack(frame) if frame else []
+
+    def _beat(self):
+        with self._lock:
+            now = time.perf_counter()
+            stalled_ms = self._blocked_ms(now)
+            started = self._last_beat
+            self._last_beat = now
+            stack, self._pending_stack = self._pending_stack, None
+        if stalled_ms >= self.threshold_ms:
+            self._record(stalled_ms, stack or [], started, now)
+
+    @staticmethod
+    def _source(stack):
+        """The innermost frame in SlugHub's own code, e.g. "main.py:1234 refresh_events"."""
+        own = [f for f in stack if f.filename.startswith(APP_DIR) and not f.filename.endswith("stall_watchdog.py")]
+        frame = (own or stack or [None])[-1]
+        if frame is None:
+            return "unknown"
+        return f"{os.path.basename(frame.filename)}:{frame.lineno} {frame.name}"
+
+    def _record(self, stalled_ms, stack, started, ended):
+        source = self._source(stack)
+        bucket = next(b for b in HISTOGRAM_BUCKETS_MS if stalled_ms < b)
+        self.histogram[bucket] += 1
+        self.sources[source][0] += 1
+        self.sources[source][1] += stalled_ms
+        print(f"⚠️ GUI stalled {stalled_ms:.0f} ms in {source}")
+        if tracing.ENABLED:
+            tracing.record("stall", "stall", started, ended, {"source": source})
+        if self.log_path:
+            try:
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({
+                        "time": time.time(),
+                        "stall_ms": round(stalled_ms, 1),
+                        "source": source,
+                        "stack": traceback.format_list(stack),
+                    }) + "\n")
+            except OSError as e:
+                print(f"⚠️ Could not write stall log: {e}")
+
+    def report(self):
+        """Histogram and freeze sources ranked by total stalled time."""
+        lines = ["GUI stalls by duration:"]
+        lower = self.threshold_ms
+        for bucket, count in self.histogram.items():
+            if bucket <= self.threshold_ms:
+                continue  # below the threshold, never recorded
+            label = f"{lower:.0f}+ ms" if bucket == float("inf") else f"{lower:.0f}-{bucket:.0f} ms"
+            lines.append(f"  {label:>14}: {count}")
+            lower = bucket
+        lines.append("Worst freeze sources:")
+        ranked = sorted(self.sources.items(), key=lambda item: -item[1][1])
+        for source, (count, total_ms) in ranked[:10]:
+            lines.append(f"  {total_ms:>9.0f} ms  {count:>4}x  {source}")
+        return "\n".join(lines)
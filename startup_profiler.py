@@ -0,0 +1,110 @@
+# startup_profiler.py
+import cProfile
+import io
+import json
+import os
+import platform
+import pstats
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+import tracing
+
+FLAG = "--profile-startup"          # time each startup phase
+CPROFILE_FLAG = "--profile-startup=cprofile"  # ...and run cProfile across all of them
+EXIT_FLAG = "--exit-after-startup"  # quit once the first window is up (for CI timing runs)
+
+
+class StartupProfiler:
+    """
+    Times the phases of a cold start (imports, storage connect, catalog scrape,
+    page constructors, stylesheets) up to the first shown window. finish()
+    prints them ranked by duration and writes a JSON report so
+    time-to-first-window can be compared across releases. Disabled, every
+    method is a no-op.
+    """
+
+    def __init__(self, enabled=False, use_cprofile=False, output_path="startup_profile.json"):
+        self.enabled = enabled
+        self.output_path = output_path
+        self.phases = []   # (name, start, end) in perf_counter seconds, in the order they finished
+        self._open = {}
+        self._origin = time.perf_counter()
+        self._profile = None
+        self.finished = False
+        if enabled and use_cprofile:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    @classmethod
+    def from_argv(cls, argv):
+        use_cprofile = CPROFILE_FLAG in argv
+        return cls(
+            enabled=FLAG in argv or use_cprofile,
+            use_cprofile=use_cprofile,
+            output_path=os.getenv("SLUGHUB_STARTUP_PROFILE", "startup_profile.json")
+        )
+
+    def start(self, name):
+        if self.enabled:
+            self._open[name] = time.perf_counter()
+
+    def stop(self, name):
+        if self.enabled and name in self._open:
+            start = self._open.pop(name)
+            end = time.perf_counter()
+            self.phases.append((name, start, end))
+            if tracing.ENABLED:
+                tracing.record(name, "startup", start, end)
+
+    def phase(self, name):
+        """with startup.phase("store_classes_in_db"): ..."""
+        if not self.enabled:
+            return nullcontext()
+        return self._phase(name)
+
+    @contextmanager
+    def _phase(self, name):
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop(name)
+
+    def _cprofile_top(self, limit=25):
+        stats = pstats.Stats(self._profile, stream=io.StringIO()).sort_stats("cumulative")
+        top = []
+        for (filename, lineno, func), (_, calls, _, cumulative, _) in stats.stats.items():
+            top.append({"function": f"{os.path.basename(filename)}:{lineno} {func}",
+                        "calls": calls, "cumulative_ms": round(cumulative * 1000, 2)})
+        return sorted(top, key=lambda f: -f["cumulative_ms"])[:limit]
+
+    def finish(self):
+        """Call once the first window has been shown: print the ranked report and write the JSON file."""
+        if not self.enabled or self.finished:
+            return
+        self.finished = True
+        total_ms = (time.perf_counter() - self._origin) * 1000
+        if self._profile is not None:
+            self._profile.disable()
+
+        phases = [{"name": name, "start_ms": round((start - self._origin) * 1000, 2),
+                   "ms": round((end - start) * 1000, 2)} for name, start, end in self.phases]
+        print(f"\nStartup profile: {total_ms:.0f} ms to first window")
+        for p in sorted(phases, key=lambda p: -p["ms"]):
+            print(f"  {p['ms']:>9.1f} ms  {p['ms'] / total_ms:>6.1%}  {p['name']}")
+
+        report = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time_to_first_window_ms": round(total_ms, 2),
+            "phases": phases,
+        }
+        if self._profile is not None:
+            report["cprofile_top"] = self._cprofile_top()
+            self._profile.dump_stats(os.path.splitext(self.output_path)[0] + ".prof")
+        with open(self.output_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote startup profile to {self.output_path}")
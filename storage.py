@@ -0,0 +1,509 @@
+# storage.py
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+try:
+    import pymongo
+    from pymongo import ASCENDING, UpdateOne
+    from pymongo.collation import Collation
+    from pymongo.errors import BulkWriteError, DuplicateKeyError
+    from pymongo.write_concern import WriteConcern
+except ImportError:  # only MongoStorage needs pymongo; SQLiteStorage runs without it
+    pymongo = None
+
+COURSE_LIST_ID = "ucsc_course_list"
+
+
+class DuplicateError(Exception):
+    """A write hit a unique key; `field` names it ("username", "email", ...)."""
+
+    def __init__(self, field, message=""):
+        super().__init__(message or f"duplicate {field}")
+        self.field = field
+
+
+class PartialWriteError(Exception):
+    """A batch write failed partway; `inserted` lists the positions that were written anyway."""
+
+    def __init__(self, inserted, message=""):
+        super().__init__(message or f"batch write failed after {len(inserted)} inserts")
+        self.inserted = inserted
+
+
+class Storage(ABC):
+    """
+    Everything SlugHub persists: users and their sessions, class schedules,
+    forum posts, the scraped course list and shared geocodes. main.py only
+    talks to this interface, so the app can run against MongoDB Atlas or an
+    embedded database. A backend that leaves a method out can't be
+    instantiated. Methods raise on backend errors; callers decide whether to
+    report or swallow them.
+    """
+
+    def ensure_indexes(self):
+        pass
+
+    # Users
+    @abstractmethod
+    def create_user(self, user):
+        """Insert a user document; raises DuplicateError for a taken username or email."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_user(self, username, fields=None):
+        """The user document (only `fields` if given), or None."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def update_user(self, username, fields):
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_schedule_version(self, username):
+        raise NotImplementedError
+
+    @abstractmethod
+    def bump_schedule_version(self, username):
+        """Increment the user's schedule version; may be fire-and-forget."""
+        raise NotImplementedError
+
+    # Remember-me sessions
+    @abstractmethod
+    def create_session(self, token_hash, username, expires_at):
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_session(self, token_hash, now):
+        """Username for an unexpired session, or None."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_session(self, token_hash):
+        raise NotImplementedError
+
+    # Class schedules
+    @abstractmethod
+    def get_classes(self, username):
+        raise NotImplementedError
+
+    @abstractmethod
+    def insert_class(self, username, data):
+        """Insert a class unless (user, id) exists; returns True if it was new."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def insert_classes(self, username, classes):
+        """
+        Insert many classes in one batch; returns the positions of the ones that
+        were new. Raises PartialWriteError if the batch failed after some inserts.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_class(self, username, class_id):
+        """Returns True if a class was deleted."""
+        raise NotImplementedError
+
+    # Forum
+    @abstractmethod
+    def forum_names(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def forum_posts(self, forum_name, after=None):
+        """Posts in a forum, oldest first; only those newer than `after` if given."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def add_forum_post(self, post):
+        raise NotImplementedError
+
+    # Course list
+    @abstractmethod
+    def get_course_list(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_course_list(self, courses):
+        raise NotImplementedError
+
+    # Shared geocodes
+    @abstractmethod
+    def find_geocodes(self, keys):
+        """{key: (lat, lng)} for the keys that are known."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_geocode(self, key, lat, lng, source):
+        """Store a geocode unless the key already has one."""
+        raise NotImplementedError
+
+
+class MongoStorage(Storage):
+    """The production backend: the slughub database on MongoDB."""
+
+    def __init__(self, db):
+        if pymongo is None:
+            raise RuntimeError("the pymongo package is needed for the MongoDB backend")
+        self.db = db
+        self.users = db["users"]
+        self.sessions = db["sessions"]
+        self.schedules = db["class_schedule"]
+        self.forum = db["forum_posts"]
+        self.courses = db["all_ucsc_classes"]
+        self.geocodes = db["geocodes"]
+        # Until ensure_indexes() has built the unique user indexes, create_user()
+        # checks for a taken username/email itself before inserting
+        self.unique_user_indexes = False
+
+    def ensure_indexes(self):
+        """
+        Create the indexes the single-round-trip write paths rely on.
+
+        The unique user indexes can't be built while users already holds
+        duplicates: the same username twice, or emails differing only in case
+        (the old check was case-sensitive, and check-then-insert could race).
+        Before deploying against an existing database, find them with
+
+            db.users.aggregate([{$group: {_id: {$toLower: "$email"}, n: {$sum: 1}}}, {$match: {n: {$gt: 1}}}])
+
+        (and the same grouped on "$username"), then merge or rename those
+        accounts. Until then signup keeps working through the slower
+        find-then-insert checks in create_user().
+        """
+        try:
+            self.schedules.create_index([("user", ASCENDING), ("id", ASCENDING)], unique=True)
+        except Exception as e:
+            print(f"[MongoDB] Error creating schedule index: {e}")
+        try:
+            self.users.create_index("username", unique=True)
+            # Strength 2 collation compares case-insensitively, so "A@x.com" and "a@x.com" collide
+            self.users.create_index("email", unique=True, collation=Collation(locale="en", strength=2))
+            self.unique_user_indexes = True
+        except Exception as e:
+            print(f"[MongoDB] ⚠️ Could not create unique user indexes, so duplicate signups are only "
+                  f"caught by pre-checks. De-duplicate users (see MongoStorage.ensure_indexes). Error: {e}")
+        try:
+            self.sessions.create_index("token_hash", unique=True)
+            # TTL index: MongoDB deletes sessions once expires_at has passed
+            self.sessions.create_index("expires_at", expireAfterSeconds=0)
+        except Exception as e:
+            print(f"[MongoDB] Error creating session indexes: {e}")
+        try:
+            self.forum.create_index([("forum_name", ASCENDING), ("timestamp", ASCENDING)])
+        except Exception as e:
+            print(f"[MongoDB] Error creating forum index: {e}")
+
+    def _check_user_taken(self, user):
+        """Find-then-insert fallback for when the unique user indexes are missing."""
+        if self.users.find_one({"username": user["username"]}, {"_id": 1}):
+            raise DuplicateError("username")
+        if self.users.find_one({"email": user["email"]}, {"_id": 1},
+                               collation=Collation(locale="en", strength=2)):
+            raise DuplicateError("email")
+
+    def create_user(self, user):
+        if not self.unique_user_indexes:
+            self._check_user_taken(user)
+        try:
+            self.users.insert_one(dict(user))
+        except DuplicateKeyError as e:
+            key_pattern = (e.details or {}).get("keyPattern", {})
+            if "email" in key_pattern or ("username" not in key_pattern and "email" in str(e)):
+                raise DuplicateError("email", str(e))
+            raise DuplicateError("username", str(e))
+
+    def find_user(self, username, fields=None):
+        projection = {"_id": 0, **{f: 1 for f in fields}} if fields else {"_id": 0}
+        return self.users.find_one({"username": username}, projection)
+
+    def update_user(self, username, fields):
+        self.users.update_one({"username": username}, {"$set": fields})
+
+    def get_schedule_version(self, username):
+        doc = self.users.find_one({"username": username}, {"schedule_version": 1})
+        return (doc or {}).get("schedule_version", 0)
+
+    def bump_schedule_version(self, username):
+        # Unacknowledged so it doesn't add a round trip to every schedule write
+        self.users.with_options(write_concern=WriteConcern(w=0)).update_one(
+            {"username": username},
+            {"$inc": {"schedule_version": 1}}
+        )
+
+    def create_session(self, token_hash, username, expires_at):
+        self.sessions.insert_one({"token_hash": token_hash, "username": username, "expires_at": expires_at})
+
+    def find_session(self, token_hash, now):
+        # The TTL monitor only runs once a minute, so check expiry here too
+        doc = self.sessions.find_one(
+            {"token_hash": token_hash, "expires_at": {"$gt": now}},
+            {"_id": 0, "username": 1}
+        )
+        return doc["username"] if doc else None
+
+    def delete_session(self, token_hash):
+        self.sessions.delete_one({"token_hash": token_hash})
+
+    def get_classes(self, username):
+        return list(self.schedules.find({"user": username}, {"_id": 0}))
+
+    @staticmethod
+    def _class_upsert(username, data):
+        """Build the (filter, update) pair that inserts a class only if (user, id) is new."""
+        data["user"] = username
+        fields = {k: v for k, v in data.items() if k not in ("user", "id", "_id")}
+        return {"user": username, "id": data["id"]}, {"$setOnInsert": fields}
+
+    def insert_class(self, username, data):
+        try:
+            result = self.schedules.update_one(*self._class_upsert(username, data), upsert=True)
+        except DuplicateKeyError:
+            # Another client inserted the same (user, id) at the same moment.
+            return False
+        return result.upserted_id is not None
+
+    def insert_classes(self, username, classes):
+        ops = [UpdateOne(*self._class_upsert(username, data), upsert=True) for data in classes]
+        try:
+            result = self.schedules.bulk_write(ops, ordered=False)
+        except BulkWriteError as e:
+            inserted = [u["index"] for u in e.details.get("upserted", [])]
+            if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])):
+                raise PartialWriteError(inserted, str(e)) from e
+            # Only duplicate-key races: the rest of the batch went through
+            return inserted
+        return list(result.upserted_ids)
+
+    def delete_class(self, username, class_id):
+        return self.schedules.delete_one({"user": username, "id": class_id}).deleted_count > 0
+
+    def forum_names(self):
+        return self.forum.distinct("forum_name")
+
+    def forum_posts(self, forum_name, after=None):
+        query = {"forum_name": forum_name}
+        if after is not None:
+            query["timestamp"] = {"$gt": after}
+        return list(self.forum.find(query).sort("timestamp", 1))
+
+    def add_forum_post(self, post):
+        self.forum.insert_one(dict(post))
+
+    def get_course_list(self):
+        doc = self.courses.find_one({"_id": COURSE_LIST_ID})
+        return doc["courses"] if doc else []
+
+    def set_course_list(self, courses):
+        # All courses in one doc with a known _id so we can easily upsert or retrieve them
+        self.courses.replace_one({"_id": COURSE_LIST_ID}, {"_id": COURSE_LIST_ID, "courses": courses}, upsert=True)
+
+    def find_geocodes(self, keys):
+        docs = self.geocodes.find({"_id": {"$in": list(keys)}}, {"lat": 1, "lng": 1})
+        return {doc["_id"]: (doc["lat"], doc["lng"]) for doc in docs}
+
+    def save_geocode(self, key, lat, lng, source):
+        self.geocodes.update_one(
+            {"_id": key},
+            {"$setOnInsert": {"lat": lat, "lng": lng, "source": source}},
+            upsert=True
+        )
+
+
+class SQLiteStorage(Storage):
+    """
+    Embedded backend for running SlugHub offline, and for load tests and
+    profiling: the same data in one SQLite file, or entirely in memory with
+    path=":memory:". Class and forum documents are stored as JSON next to the
+    columns that get queried. One connection is shared by the GUI and worker
+    threads behind a lock.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS users (
+            username TEXT PRIMARY KEY,
+            email TEXT UNIQUE COLLATE NOCASE,
+            doc TEXT NOT NULL,
+            schedule_version INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS sessions (
+            token_hash TEXT PRIMARY KEY,
+            username TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS class_schedule (
+            user TEXT NOT NULL,
+            id TEXT NOT NULL,
+            doc TEXT NOT NULL,
+            PRIMARY KEY (user, id)
+        );
+        CREATE TABLE IF NOT EXISTS forum_posts (
+            forum_name TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            doc TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS forum_posts_by_time ON forum_posts (forum_name, timestamp);
+        CREATE TABLE IF NOT EXISTS course_list (
+            id TEXT PRIMARY KEY,
+            courses TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS geocodes (
+            key TEXT PRIMARY KEY,
+            lat REAL NOT NULL,
+            lng REAL NOT NULL,
+            source TEXT
+        );
+    """
+
+    def __init__(self, path=":memory:"):
+        self.path = path
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+
+    def ensure_indexes(self):
+        with self._lock, self._conn:
+            self._conn.executescript(self.SCHEMA)
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _write(self, sql, params=()):
+        """Run one statement in its own transaction; returns the affected row count."""
+        with self._lock, self._conn:
+            return self._conn.execute(sql, params).rowcount
+
+    @staticmethod
+    def _timestamp(ts):
+        # Fixed-width ISO text sorts in time order
+        return ts.isoformat(timespec="microseconds")
+
+    @staticmethod
+    def _encode(doc):
+        return json.dumps({k: v for k, v in doc.items() if k != "_id"}, default=str)
+
+    def create_user(self, user):
+        try:
+            self._write(
+                "INSERT INTO users (username, email, doc) VALUES (?, ?, ?)",
+                (user["username"], user.get("email"), self._encode(user))
+            )
+        except sqlite3.IntegrityError as e:
+            raise DuplicateError("email" if "users.email" in str(e) else "username", str(e))
+
+    def find_user(self, username, fields=None):
+        rows = self._query("SELECT doc, schedule_version FROM users WHERE username = ?", (username,))
+        if not rows:
+            return None
+        user = json.loads(rows[0][0])
+        user["schedule_version"] = rows[0][1]
+        return {f: user[f] for f in fields if f in user} if fields else user
+
+    def update_user(self, username, fields):
+        with self._lock, self._conn:
+            rows = self._conn.execute("SELECT doc FROM users WHERE username = ?", (username,)).fetchall()
+            if rows:
+                user = {**json.loads(rows[0][0]), **fields}
+                self._conn.execute("UPDATE users SET doc = ? WHERE username = ?", (self._encode(user), username))
+
+    def get_schedule_version(self, username):
+        rows = self._query("SELECT schedule_version FROM users WHERE username = ?", (username,))
+        return rows[0][0] if rows else 0
+
+    def bump_schedule_version(self, username):
+        self._write("UPDATE users SET schedule_version = schedule_version + 1 WHERE username = ?", (username,))
+
+    def create_session(self, token_hash, username, expires_at):
+        with self._lock, self._conn:
+            # Stand-in for MongoDB's TTL index
+            self._conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (datetime.now().timestamp(),))
+            self._conn.execute(
+                "INSERT INTO sessions (token_hash, username, expires_at) VALUES (?, ?, ?)",
+                (token_hash, username, expires_at.timestamp())
+            )
+
+    def find_session(self, token_hash, now):
+        rows = self._query(
+            "SELECT username FROM sessions WHERE token_hash = ? AND expires_at > ?",
+            (token_hash, now.timestamp())
+        )
+        return rows[0][0] if rows else None
+
+    def delete_session(self, token_hash):
+        self._write("DELETE FROM sessions WHERE token_hash = ?", (token_hash,))
+
+    def get_classes(self, username):
+        return [json.loads(doc) for (doc,) in self._query(
+            "SELECT doc FROM class_schedule WHERE user = ? ORDER BY rowid", (username,)
+        )]
+
+    def insert_class(self, username, data):
+        data["user"] = username
+        return self._write(
+            "INSERT OR IGNORE INTO class_schedule (user, id, doc) VALUES (?, ?, ?)",
+            (username, data["id"], self._encode(data))
+        ) > 0
+
+    def insert_classes(self, username, classes):
+        inserted = []
+        with self._lock, self._conn:
+            for position, data in enumerate(classes):
+                data["user"] = username
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO class_schedule (user, id, doc) VALUES (?, ?, ?)",
+                    (username, data["id"], self._encode(data))
+                )
+                if cursor.rowcount:
+                    inserted.append(position)
+        return inserted
+
+    def delete_class(self, username, class_id):
+        return self._write("DELETE FROM class_schedule WHERE user = ? AND id = ?", (username, class_id)) > 0
+
+    def forum_names(self):
+        return [name for (name,) in self._query("SELECT DISTINCT forum_name FROM forum_posts ORDER BY forum_name")]
+
+    def forum_posts(self, forum_name, after=None):
+        sql = "SELECT doc FROM forum_posts WHERE forum_name = ?"
+        params = [forum_name]
+        if after is not None:
+            sql += " AND timestamp > ?"
+            params.append(self._timestamp(after))
+        posts = []
+        for (doc,) in self._query(sql + " ORDER BY timestamp", params):
+            post = json.loads(doc)
+            post["timestamp"] = datetime.fromisoformat(post["timestamp"])
+            posts.append(post)
+        return posts
+
+    def add_forum_post(self, post):
+        doc = dict(post, timestamp=self._timestamp(post["timestamp"]))
+        self._write(
+            "INSERT INTO forum_posts (forum_name, timestamp, doc) VALUES (?, ?, ?)",
+            (post["forum_name"], doc["timestamp"], self._encode(doc))
+        )
+
+    def get_course_list(self):
+        rows = self._query("SELECT courses FROM course_list WHERE id = ?", (COURSE_LIST_ID,))
+        return json.loads(rows[0][0]) if rows else []
+
+    def set_course_list(self, courses):
+        self._write("INSERT OR REPLACE INTO course_list (id, courses) VALUES (?, ?)", (COURSE_LIST_ID, json.dumps(courses)))
+
+    def find_geocodes(self, keys):
+        keys = list(keys)
+        if not keys:
+            return {}
+        rows = self._query(
+            f"SELECT key, lat, lng FROM geocodes WHERE key IN ({', '.join('?' * len(keys))})", keys
+        )
+        return {key: (lat, lng) for key, lat, lng in rows}
+
+    def save_geocode(self, key, lat, lng, source):
+        self._write("INSERT OR IGNORE INTO geocodes (key, lat, lng, source) VALUES (?, ?, ?, ?)", (key, lat, lng, source))
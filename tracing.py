@@ -0,0 +1,98 @@
+# tracing.py
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+# SLUGHUB_TRACE=<file.json> (or 1 for slughub_trace.json) records spans and writes
+# them as Chrome trace events at exit; open the file in chrome://tracing or Perfetto.
+_trace_setting = os.getenv("SLUGHUB_TRACE", "")
+TRACE_PATH = "slughub_trace.json" if _trace_setting.lower() in ("1", "true", "yes") else _trace_setting
+ENABLED = bool(TRACE_PATH)
+
+_events = []         # list.append is atomic, so spans from worker threads need no lock
+_thread_names = {}
+_origin = time.perf_counter()
+_NULL_SPAN = nullcontext()
+
+
+def record(name, cat, start, end, args=None):
+    """Add a finished span; start/end are time.perf_counter() seconds."""
+    thread = threading.current_thread()
+    _thread_names.setdefault(thread.ident, thread.name)
+    event = {
+        "name": name,
+        "cat": cat,
+        "ph": "X",
+        "ts": round((start - _origin) * 1e6, 1),
+        "dur": round((end - start) * 1e6, 1),
+        "pid": os.getpid(),
+        "tid": thread.ident,
+    }
+    if args:
+        event["args"] = args
+    _events.append(event)
+
+
+class _Span:
+    __slots__ = ("name", "cat", "args", "start")
+
+    def __init__(self, name, cat, args):
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args = dict(self.args or {}, error=exc_type.__name__)
+        record(self.name, self.cat, self.start, time.perf_counter(), self.args)
+        return False
+
+
+def span(name, cat="app", **args):
+    """
+    Context manager timing a block:  with span("load posts", "db", forum=name): ...
+    Returns a shared no-op context when tracing is off.
+    """
+    if not ENABLED:
+        return _NULL_SPAN
+    return _Span(name, cat, args or None)
+
+
+def traced(name=None, cat="app"):
+    """Decorator version of span(); with tracing off it returns the function untouched."""
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _Span(label, cat, None):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def export(path=None):
+    """Write everything recorded so far as a Chrome trace-event JSON file."""
+    path = path or TRACE_PATH
+    pid = os.getpid()
+    metadata = [
+        {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}}
+        for tid, thread_name in list(_thread_names.items())
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": metadata + list(_events), "displayTimeUnit": "ms"}, f)
+    print(f"Wrote {len(_events)} trace events to {path}")
+
+
+if ENABLED:
+    atexit.register(export)
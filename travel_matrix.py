@@ -0,0 +1,86 @@
+# travel_matrix.py
+from campus_router import get_router
+from geo import haversine_m
+from geocode_cache import normalize_location
+from schedule_index import MINUTES_PER_DAY, meeting_duration
+
+TRAVEL_MODES = ["WALKING", "BICYCLING", "DRIVING", "TRANSIT"]
+
+# Straight-line fallback: meters/second, a detour factor for real paths, and
+# fixed overhead seconds (parking, waiting for a shuttle).
+FALLBACK_SPEEDS = {"WALKING": 1.3, "BICYCLING": 4.5, "DRIVING": 9.0, "TRANSIT": 6.0}
+FALLBACK_OVERHEAD = {"WALKING": 0, "BICYCLING": 60, "DRIVING": 300, "TRANSIT": 420}
+DETOUR_FACTOR = 1.4
+
+
+def straight_line_seconds(a_latlng, b_latlng, mode):
+    """Rough travel time from two coordinates when no router knows the route."""
+    meters = haversine_m(a_latlng, b_latlng) * DETOUR_FACTOR
+    return meters / FALLBACK_SPEEDS[mode] + FALLBACK_OVERHEAD[mode]
+
+
+def place_key(location):
+    """
+    Which place a class location is: its campus building node when the router
+    knows it, else the location text minus any explicit room number. "BE 152"
+    and "Baskin Engineering 165" are one place; "College 9" and "College 10"
+    are two.
+    """
+    node_id = get_router().resolve(location)
+    return ("building", node_id) if node_id else ("text", normalize_location(location))
+
+
+class TravelTimeMatrix:
+    """
+    Travel seconds between class locations, per travel mode, memoized by
+    place_key() pair so buildings shared across classes (and users) are only
+    routed once. `estimator(from_location, to_location, mode)` is
+    whatever routing backend is available and may return None.
+    """
+
+    def __init__(self, estimator):
+        self.estimator = estimator
+        self._memo = {}
+
+    def __len__(self):
+        return len(self._memo)
+
+    def travel_seconds(self, from_location, to_location, mode):
+        a, b = place_key(from_location), place_key(to_location)
+        if a == b:
+            return 0
+        key = (a, b, mode)
+        if key not in self._memo:
+            seconds = self.estimator(from_location, to_location, mode)
+            if seconds is None:
+                return None  # not memoized: a later geocode may make it routable
+            self._memo[key] = seconds
+        return self._memo[key]
+
+    def transitions(self, meetings, modes=TRAVEL_MODES):
+        """
+        Back-to-back moves in a week of meetings (sorted (minute_of_week, class)
+        pairs, e.g. from a ScheduleIndex). Returns one dict per same-day pair in
+        different places: from/to classes, the gap in minutes, travel seconds per
+        mode and the modes that don't fit in the gap.
+        """
+        result = []
+        meetings = list(meetings)
+        for (prev_start, prev), (next_start, nxt) in zip(meetings, meetings[1:]):
+            if prev_start // MINUTES_PER_DAY != next_start // MINUTES_PER_DAY:
+                continue
+            gap = next_start - (prev_start + meeting_duration(prev))
+            if gap < 0:
+                continue  # overlapping blocks are reported as conflicts instead
+            if place_key(prev.get("location")) == place_key(nxt.get("location")):
+                continue
+            seconds = {m: self.travel_seconds(prev["location"], nxt["location"], m) for m in modes}
+            result.append({
+                "from": prev,
+                "to": nxt,
+                "to_start": next_start,
+                "gap_minutes": gap,
+                "seconds": seconds,
+                "tight_modes": [m for m, s in seconds.items() if s is not None and s > gap * 60],
+            })
+        return result